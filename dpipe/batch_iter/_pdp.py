@@ -1,7 +1,10 @@
+from functools import partial
 from multiprocessing.pool import ThreadPool
+from queue import Queue
 from threading import Event, Semaphore, Thread
-from typing import Callable
+from typing import Callable, NamedTuple
 
+import numpy as np
 from pdp import Pipeline
 from pdp.interface import ComponentDescription, Source, One2One
 from pdp.base import SourceExhausted, StopEvent
@@ -37,11 +40,87 @@ def start_iter(q_in, q_out, stop_event: Event, *, transform: Callable, n_workers
     ThreadPool(n_workers, target).close()
 
 
-def start_loky(q_in, q_out, stop_event: Event, *, transform: Callable, n_workers: int, args, kwargs):
+def get_shared_memory():
+    # `multiprocessing.shared_memory` is only available since python 3.8
+    try:
+        from multiprocessing.shared_memory import SharedMemory
+    except ImportError:
+        raise ImportError(
+            '`sample_nbytes` requires `multiprocessing.shared_memory`, which is available since python 3.8'
+        ) from None
+
+    return SharedMemory
+
+
+class SharedArray(NamedTuple):
+    shape: tuple
+    dtype: np.dtype
+    offset: int
+
+
+class SharedResult(NamedTuple):
+    slab: str
+    # arrays written to the slab are replaced by `SharedArray`, other fields are pickled as usual
+    fields: tuple
+    # whether `transform` returned a single array instead of a tuple
+    single: bool
+
+
+def _write_shared(slab: str, transform: Callable, value, *args, **kwargs):
+    result = transform(value, *args, **kwargs)
+    single = isinstance(result, np.ndarray)
+    if not single and type(result) is not tuple:
+        return result
+
+    values = (result,) if single else result
+    fields, offset = [], 0
+    for value in values:
+        if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+            offset += -offset % value.dtype.alignment
+            fields.append(SharedArray(value.shape, value.dtype, offset))
+            offset += value.nbytes
+        else:
+            fields.append(value)
+
+    if not any(isinstance(field, SharedArray) for field in fields):
+        return result
+
+    # the registration is owned by the parent: the workers share its resource tracker
+    shm = get_shared_memory()(slab)
+    try:
+        if offset > shm.size:
+            return result
+
+        for field, array in zip(fields, values):
+            if isinstance(field, SharedArray):
+                _shared_view(shm, field)[...] = array
+    finally:
+        shm.close()
+
+    return SharedResult(slab, tuple(fields), single)
+
+
+def _shared_view(shm, field: SharedArray) -> np.ndarray:
+    return np.ndarray(field.shape, field.dtype, buffer=shm.buf, offset=field.offset)
+
+
+def _read_shared(shm, result: SharedResult):
+    fields = tuple(
+        _shared_view(shm, field).copy() if isinstance(field, SharedArray) else field for field in result.fields
+    )
+    return fields[0] if result.single else fields
+
+
+def start_loky(q_in, q_out, stop_event: Event, *, transform: Callable, n_workers: int, args, kwargs,
+               sample_nbytes: int = None):
     def target():
-        def done(future: Future):
+        def done(future: Future, slab: str = None):
             try:
-                q_out.put(future.result())
+                result = future.result()
+                if isinstance(result, SharedResult):
+                    result = _read_shared(slabs[result.slab], result)
+
+                q_out.put(result)
                 q_in.task_done()
 
             except BaseException:
@@ -49,8 +128,21 @@ def start_loky(q_in, q_out, stop_event: Event, *, transform: Callable, n_workers
                 raise
 
             finally:
+                if slab is not None:
+                    free_slabs.put(slab)
                 counter.release()
 
+        # at most `n_workers` values are processed at once, so each of them gets its own slab
+        slabs = {}
+        if sample_nbytes is not None:
+            SharedMemory = get_shared_memory()
+            for _ in range(n_workers):
+                shm = SharedMemory(create=True, size=sample_nbytes)
+                slabs[shm.name] = shm
+        free_slabs = Queue()
+        for name in slabs:
+            free_slabs.put(name)
+
         # start worker
         executor = ProcessPoolExecutor(n_workers)
         counter = Semaphore(n_workers)
@@ -59,7 +151,12 @@ def start_loky(q_in, q_out, stop_event: Event, *, transform: Callable, n_workers
         try:
             for value in iter(q_in.get, SourceExhausted()):
                 counter.acquire()
-                executor.submit(transform, value, *args, **kwargs).add_done_callback(done)
+                if slabs:
+                    slab = free_slabs.get()
+                    executor.submit(_write_shared, slab, transform, value, *args, **kwargs).add_done_callback(
+                        partial(done, slab=slab))
+                else:
+                    executor.submit(transform, value, *args, **kwargs).add_done_callback(done)
 
             # wait for other processes
             q_in.task_done()
@@ -75,5 +172,8 @@ def start_loky(q_in, q_out, stop_event: Event, *, transform: Callable, n_workers
 
         finally:
             executor.shutdown(wait=wait)
+            for shm in slabs.values():
+                shm.close()
+                shm.unlink()
 
     Thread(target=target).start()
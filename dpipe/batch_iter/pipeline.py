@@ -1,13 +1,17 @@
 import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from itertools import islice
 from typing import Iterable, Callable, Union
+from warnings import warn
 
 import numpy as np
 
 from ..itertools import zip_equal
 from ..im.axes import AxesParams
 from .utils import pad_batch_equal
+from ._pdp import Pipeline, ComponentDescription, Source, One2One, start_iter, start_loky, get_shared_memory
 
 __all__ = [
     'Infinite',
@@ -23,6 +27,32 @@ def combine_batches(inputs):
     return tuple(zip_equal(*inputs))
 
 
+class _BatchPool:
+    """
+    A pool of arrays that can be reused for new batches, grouped by shape and dtype.
+    At most ``depth`` free arrays of each kind are kept.
+    """
+
+    def __init__(self, depth: int):
+        self.depth = depth
+        self._free = {}
+
+    def get(self, shape: tuple, dtype) -> np.ndarray:
+        free = self._free.get((shape, np.dtype(dtype)))
+        if free:
+            try:
+                return free.popleft()
+            except IndexError:
+                pass
+
+        return np.empty(shape, dtype)
+
+    def put(self, array: np.ndarray):
+        # views, e.g. of incomplete batches, are not reused
+        if isinstance(array, np.ndarray) and array.base is None:
+            self._free.setdefault((array.shape, array.dtype), deque(maxlen=self.depth)).append(array)
+
+
 def combine_to_arrays(inputs):
     """
     Combines tuples from ``inputs`` into batches of numpy arrays.
@@ -30,6 +60,21 @@ def combine_to_arrays(inputs):
     return tuple(map(np.array, combine_batches(inputs)))
 
 
+def _combine_to_pooled_arrays(inputs, pool: _BatchPool):
+    # same as `combine_to_arrays`, but the arrays are taken from the ``pool``
+    result = []
+    for field in combine_batches(inputs):
+        arrays = list(map(np.asarray, field))
+        first = arrays[0]
+        if any(x.shape != first.shape or x.dtype != first.dtype for x in arrays):
+            # heterogeneous field: let numpy resolve the resulting shape and dtype
+            result.append(np.array(field))
+        else:
+            result.append(np.stack(arrays, out=pool.get((len(arrays), *first.shape), first.dtype)))
+
+    return tuple(result)
+
+
 def combine_pad(inputs, padding_values: AxesParams = 0, ratio: AxesParams = 0.5):
     """
     Combines tuples from ``inputs`` into batches and pads each batch in order to obtain
@@ -49,7 +94,10 @@ def combine_pad(inputs, padding_values: AxesParams = 0, ratio: AxesParams = 0.5)
     `pad_to_shape`
     """
     batches = combine_batches(inputs)
-    padding_values = np.broadcast_to(padding_values, [len(batches)])
+    if np.isscalar(padding_values) or callable(padding_values):
+        return tuple(pad_batch_equal(x, padding_values, ratio) for x in batches)
+
+    padding_values = np.broadcast_to(padding_values, [len(batches)]).tolist()
     return tuple(pad_batch_equal(x, values, ratio) for x, values in zip(batches, padding_values))
 
 
@@ -76,6 +124,11 @@ class Infinite:
     combiner: Callable
         combines chunks of single batches in multiple batches, e.g. combiner([(x, y), (x, y)]) -> ([x, x], [y, y]).
         Default is `combine_to_arrays`.
+    reuse_buffers: bool
+        whether to reuse the arrays of the already consumed batches for the new ones, instead of allocating
+        new arrays for each batch. If True, a batch is only valid until the next batch is requested:
+        after that its arrays will be overwritten, so copy them if they are needed for longer.
+        Only supported for an integer ``batch_size`` and the default ``combiner``. Default is False.
     kwargs:
         additional keyword arguments passed to the ``combiner``.
 
@@ -86,16 +139,25 @@ class Infinite:
 
     def __init__(self, source: Iterable, *transformers: Union[Callable, Transform],
                  batch_size: Union[int, Callable], batches_per_epoch: int,
-                 buffer_size: int = 1, combiner: Callable = combine_to_arrays, **kwargs):
+                 buffer_size: int = 1, combiner: Callable = combine_to_arrays, reuse_buffers: bool = False, **kwargs):
         if batches_per_epoch <= 0:
             raise ValueError(f'Expected a positive amount of batches per epoch, but got {batches_per_epoch}')
 
+        if reuse_buffers and not (isinstance(batch_size, int) and combiner is combine_to_arrays and not kwargs):
+            raise ValueError(
+                '`reuse_buffers` is only supported for an integer `batch_size` and the default `combiner`.'
+            )
+
+        self._pool = None
+        if reuse_buffers:
+            # the batches that are buffered in the pipeline, the one being built and the one being consumed
+            self._pool = _BatchPool(buffer_size + 2)
+            batchers = self._make_stacker(batch_size), Threads(partial(_combine_to_pooled_arrays, pool=self._pool))
+        else:
+            batchers = self._make_stacker(batch_size), Threads(partial(combiner, **kwargs))
+
         self.batches_per_epoch = batches_per_epoch
-        self.pipeline = wrap_pipeline(
-            source, *transformers,
-            self._make_stacker(batch_size), Threads(partial(combiner, **kwargs)),
-            buffer_size=buffer_size
-        )
+        self.pipeline = wrap_pipeline(source, *transformers, *batchers, buffer_size=buffer_size)
 
     @staticmethod
     def _make_stacker(batch_size):
@@ -134,7 +196,18 @@ class Infinite:
     def __call__(self):
         if not self.pipeline.pipeline_active:
             self.__enter__()
-        return islice(self.pipeline, self.batches_per_epoch)
+
+        batches = islice(self.pipeline, self.batches_per_epoch)
+        if self._pool is not None:
+            batches = self._recycle(batches)
+        return batches
+
+    def _recycle(self, batches):
+        for batch in batches:
+            yield batch
+            # the previous batch is no longer used once the next one is requested
+            for array in batch:
+                self._pool.put(array)
 
     def __enter__(self):
         self.pipeline.__enter__()
@@ -148,8 +221,6 @@ class Infinite:
 
 
 def wrap_pipeline(source, *transformers, buffer_size=1):
-    from ._pdp import Pipeline, ComponentDescription, Source, One2One
-
     def wrap(o):
         if isinstance(o, Transform):
             return o.component
@@ -186,8 +257,6 @@ class Iterator(Transform):
     """
 
     def __init__(self, transform: Callable, *args, n_workers: int = 1, buffer_size: int = 1, **kwargs):
-        from ._pdp import ComponentDescription, start_iter
-
         assert n_workers > 0
         assert buffer_size > 0
 
@@ -200,30 +269,64 @@ class Threads(Iterator):
     """
     Apply ``func`` concurrently to each object in the batch iterator by moving it to ``n_workers`` threads.
 
+    A single scheduler thread pulls the values and dispatches ``func`` calls to a thread pool,
+    the results are yielded in the original order.
+
     Parameters
     ----------
-    transform: Callable(Iterable) -> Iterable
-        a function that takes an iterable and yields transformed values.
+    func: Callable
+        a function that takes a single value and returns the transformed one.
     n_workers: int
-        the number of threads to which ``transform`` will be moved.
+        the number of threads to which ``func`` will be moved.
     buffer_size: int
         the number of objects to keep buffered.
+    expects_gil_release: bool
+        whether ``func`` spends most of its time in code that releases the GIL (e.g. numpy operations or file I/O).
+        If False, threads give no speedup, so the calls are moved to processes via `Loky` instead.
     args:
-        additional positional arguments passed to ``transform``.
+        additional positional arguments passed to ``func``.
     kwargs:
-        additional keyword arguments passed to ``transform``.
+        additional keyword arguments passed to ``func``.
 
     References
     ----------
     See the :doc:`tutorials/batch_iter` tutorial for more details.
     """
 
-    def __init__(self, func: Callable, *args, n_workers: int = 1, buffer_size: int = 1, **kwargs):
+    def __init__(self, func: Callable, *args, n_workers: int = 1, buffer_size: int = 1,
+                 expects_gil_release: bool = True, **kwargs):
+        if not expects_gil_release:
+            warn('`func` does not release the GIL, falling back to process-based parallelism via `Loky`.',
+                 UserWarning)
+            self.component = Loky(func, *args, n_workers=n_workers, buffer_size=buffer_size, **kwargs).component
+            return
+
+        assert n_workers > 0
+        assert buffer_size > 0
+
+        if n_workers == 1:
+            # a single worker gains nothing from the pool, so `func` is called by the scheduler itself
+            def transform_map(iterable):
+                for value in iterable:
+                    yield func(value, *args, **kwargs)
+
+            super().__init__(transform_map, n_workers=1, buffer_size=buffer_size)
+            return
+
+        executor = ThreadPoolExecutor(n_workers)
+        max_in_flight = buffer_size * n_workers
+
         def transform_map(iterable):
+            in_flight = deque()
             for value in iterable:
-                yield func(value, *args, **kwargs)
+                in_flight.append(executor.submit(func, value, *args, **kwargs))
+                if len(in_flight) >= max_in_flight:
+                    yield in_flight.popleft().result()
 
-        super().__init__(transform_map, n_workers=n_workers, buffer_size=buffer_size)
+            while in_flight:
+                yield in_flight.popleft().result()
+
+        super().__init__(transform_map, n_workers=1, buffer_size=buffer_size)
 
 
 class Loky(Transform):
@@ -240,6 +343,11 @@ class Loky(Transform):
         the number of objects to keep buffered.
     args:
         additional positional arguments passed to ``transform``.
+    sample_nbytes: int, None
+        the maximum total size (in bytes) of the numpy arrays returned by ``func``. If provided, a returned array,
+        or the arrays inside a returned tuple, e.g. ``(x, y)``, are passed back from the workers through
+        preallocated shared memory instead of being pickled. Larger results, as well as other objects,
+        are pickled as usual.
     kwargs:
         additional keyword arguments passed to ``transform``.
 
@@ -252,15 +360,18 @@ class Loky(Transform):
     See the :doc:`tutorials/batch_iter` tutorial for more details.
     """
 
-    def __init__(self, func: Callable, *args, n_workers: int = 1, buffer_size: int = 1, **kwargs):
-        from ._pdp import start_loky, ComponentDescription
-
+    def __init__(self, func: Callable, *args, n_workers: int = 1, buffer_size: int = 1, sample_nbytes: int = None,
+                 **kwargs):
         if n_workers < 0:
             n_workers = max(1, multiprocessing.cpu_count() + n_workers + 1)
 
         assert n_workers > 0
         assert buffer_size > 0
+        assert sample_nbytes is None or sample_nbytes > 0
+        if sample_nbytes is not None:
+            # fail early on older pythons
+            get_shared_memory()
 
         self.component = ComponentDescription(partial(
-            start_loky, transform=func, n_workers=n_workers, args=args, kwargs=kwargs
+            start_loky, transform=func, n_workers=n_workers, args=args, kwargs=kwargs, sample_nbytes=sample_nbytes
         ), n_workers, buffer_size)
@@ -4,9 +4,8 @@ the coordinates of the upper left and lower right corners of an n-dimensional re
 
 In slicing operations, as everywhere in Python, the left corner is inclusive, and the right one is non-inclusive.
 """
-import itertools
 from functools import wraps
-from typing import Callable
+from typing import Callable, List, Tuple
 
 import numpy as np
 
@@ -27,7 +26,7 @@ def make_box_(iterable) -> Box:
     box.setflags(write=False)
 
     assert box.ndim == 2 and len(box) == 2, box.shape
-    assert np.all(box[0] <= box[1]), box
+    assert (box[0] <= box[1]).all(), box
 
     return box
 
@@ -79,7 +78,13 @@ def get_box_padding(box: Box, limit):
      Returns padding in numpy form, so it can be given to `numpy.pad`.
      """
     check_len(*box, limit)
-    return np.maximum([-box[0], box[1] - limit], 0).T
+    box, limit = np.asarray(box), np.asarray(limit)
+
+    padding = np.empty((len(limit), 2), np.result_type(box, limit))
+    np.negative(box[0], out=padding[:, 0])
+    np.subtract(box[1], limit, out=padding[:, 1])
+    np.maximum(padding, 0, out=padding)
+    return padding
 
 
 @returns_box
@@ -110,25 +115,41 @@ def get_centered_box(center: np.ndarray, box_size: np.ndarray):
     return start, stop
 
 
+def _any_projections(mask: np.ndarray):
+    """Returns ``np.any`` of the ``mask`` along all the axes but one, for each axis."""
+    if mask.ndim <= 1:
+        return [mask]
+    # the reduction along the last axis is reused for all the other axes
+    return _any_projections(np.any(mask, axis=-1)) + [np.any(mask, axis=tuple(range(mask.ndim - 1)))]
+
+
 @returns_box
 def mask2bounding_box(mask: np.ndarray):
     """
     Find the smallest box that contains all true values of the ``mask``.
     """
-    if not mask.any():
-        raise ValueError('The mask is empty.')
-
     start, stop = [], []
-    for ax in itertools.combinations(range(mask.ndim), mask.ndim - 1):
-        nonzero = np.any(mask, axis=ax)
-        if np.any(nonzero):
-            left, right = np.where(nonzero)[0][[0, -1]]
-        else:
-            left, right = 0, 0
-        start.insert(0, left)
-        stop.insert(0, right + 1)
+    for nonzero in _any_projections(mask):
+        nonzero = np.flatnonzero(nonzero)
+        if nonzero.size == 0:
+            raise ValueError('The mask is empty.')
+
+        start.append(nonzero[0])
+        stop.append(nonzero[-1] + 1)
     return start, stop
 
 
 def box2slices(box: Box):
     return build_slices(*box)
+
+
+def boxes2slices(starts: np.ndarray, stops: np.ndarray) -> List[Tuple[slice, ...]]:
+    """
+    Returns a list of tuples of slices for a batch of boxes, given by the arrays of ``starts`` and ``stops``
+    of shape ``(n_boxes, ndim)``.
+    """
+    starts, stops = np.asarray(starts), np.asarray(stops)
+    if starts.ndim != 2 or starts.shape != stops.shape:
+        raise ValueError(f'Expected starts and stops of equal shape (n_boxes, ndim): {starts.shape}, {stops.shape}.')
+
+    return [tuple(map(slice, start, stop)) for start, stop in zip(starts.tolist(), stops.tolist())]
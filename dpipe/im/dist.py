@@ -1,18 +1,37 @@
 """
 Module for calculation of various statistics given a discrete or piecewise-linear distribution.
 """
+import string
+import sys
 from typing import Union, Sequence, Callable
 
-import torch
 import numpy as np
 
-from .axes import fill_by_indices, AxesLike, axis_from_dim
+from .axes import AxesLike, axis_from_dim
 from ..itertools import zip_equal, collect
-from ..torch import to_var
 
 __all__ = 'weighted_sum', 'expectation', 'marginal_expectation', 'polynomial'
 
-Tensor = Union[np.ndarray, torch.Tensor]
+Tensor = Union[np.ndarray, 'torch.Tensor']
+
+
+def __getattr__(name):
+    # torch is imported only when it's needed
+    if name == 'torch':
+        import torch
+        globals()['torch'] = torch
+        return torch
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+if sys.version_info < (3, 7):
+    # module-level `__getattr__` (PEP 562) is not supported
+    import torch
+
+
+def _is_tensor(x) -> bool:
+    return type(x).__module__.startswith('torch')
 
 
 def weighted_sum(weights: Tensor, axis: AxesLike, values_range: Callable) -> Tensor:
@@ -32,12 +51,24 @@ def weighted_sum(weights: Tensor, axis: AxesLike, values_range: Callable) -> Ten
 
     values = values_range(np.array(weights.shape)[axis])
 
-    shape = fill_by_indices(np.ones_like(weights.shape), values.shape, axis)
-    values = values.reshape(*shape)
-    if isinstance(weights, torch.Tensor) and not isinstance(values, torch.Tensor):
-        values = to_var(values).to(weights)
+    # the multiplication and the reduction are fused by `einsum`, so no temporary array is created
+    axes = axis_from_dim(axis, weights.ndim)
+    values = values.reshape([weights.shape[ax] for ax in axes])
+    letters = string.ascii_letters[:weights.ndim]
+    subscripts = '{},{}->{}'.format(
+        letters, ''.join(letters[ax] for ax in axes),
+        ''.join(letter for ax, letter in enumerate(letters) if ax not in axes),
+    )
 
-    return (weights * values).sum(axis)
+    if _is_tensor(weights):
+        import torch
+        from ..torch import to_var
+
+        if not _is_tensor(values):
+            values = to_var(values)
+        return torch.einsum(subscripts, weights, values.to(weights))
+
+    return np.einsum(subscripts, weights, values)
 
 
 def polynomial(n: int, order=1) -> np.ndarray:
@@ -53,6 +84,16 @@ def polynomial(n: int, order=1) -> np.ndarray:
     return np.arange(n) ** power / power
 
 
+def _polynomial_delta(n: int, order=1) -> np.ndarray:
+    """Same as ``np.diff(polynomial(n + 1, order))``, but computed inplace."""
+    power = order + 1
+    values = np.arange(n + 1, dtype=float)
+    np.power(values, power, out=values)
+    delta = np.subtract(values[1:], values[:-1])
+    delta /= power
+    return delta
+
+
 def expectation(distribution: Tensor, axis: int, integral: Callable = polynomial, *args, **kwargs) -> Tensor:
     r"""
     Calculates the expectation of a function ``h`` given its ``integral`` and a ``distribution``.
@@ -89,6 +130,9 @@ def expectation(distribution: Tensor, axis: int, integral: Callable = polynomial
     """
 
     def integral_delta(n):
+        if integral is polynomial:
+            return _polynomial_delta(n, *args, **kwargs)
+
         values = integral(n + 1, *args, **kwargs)
         return values[1:] - values[:-1]  # can't use np.diff for compatibility with pytorch
 
@@ -8,12 +8,43 @@ import numpy as np
 
 from .shape_ops import crop_to_box
 from .axes import fill_by_indices, AxesLike, resolve_deprecation, axis_from_dim, broadcast_to_axis
-from .box import make_box_, Box
+from .box import Box
 from dpipe.itertools import zip_equal, peek
 from .shape_utils import shape_after_convolution
 from .utils import build_slices
 
-__all__ = 'get_boxes', 'divide', 'combine', 'PatchCombiner', 'Average'
+__all__ = 'get_boxes', 'get_boxes_batched', 'divide', 'combine', 'PatchCombiner', 'Average'
+
+
+def get_boxes_batched(shape: AxesLike, box_size: AxesLike, stride: AxesLike, axis: AxesLike = None,
+                      valid: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get all the boxes appropriate for a tensor of shape ``shape`` in a convolution-like fashion at once.
+
+    Returns two contiguous arrays of shape ``(n_boxes, len(shape))``: the starts and the stops of the boxes,
+    in the same order as they are yielded by `get_boxes`.
+
+    Parameters
+    ----------
+    shape
+        the input tensor's shape.
+    box_size
+    axis
+        axes along which the slices will be taken.
+    stride
+        the stride (step-size) of the slice.
+    valid
+        whether boxes of size smaller than ``box_size`` should be left out.
+    """
+    axis = resolve_deprecation(axis, len(shape), box_size, stride)
+    box_size, stride = broadcast_to_axis(axis, box_size, stride)
+    box_size = fill_by_indices(shape, box_size, axis)
+    stride = fill_by_indices(np.ones_like(shape), stride, axis)
+
+    final_shape = shape_after_convolution(shape, box_size, stride, valid=valid)
+    starts = np.multiply(np.indices(final_shape).reshape(len(final_shape), -1).T, stride, order='C')
+    stops = np.minimum(starts + box_size, shape)
+    return starts, stops
 
 
 def get_boxes(shape: AxesLike, box_size: AxesLike, stride: AxesLike, axis: AxesLike = None,
@@ -36,16 +67,12 @@ def get_boxes(shape: AxesLike, box_size: AxesLike, stride: AxesLike, axis: AxesL
     References
     ----------
     See the :doc:`tutorials/patches` tutorial for more details.
+    `get_boxes_batched`
     """
-    axis = resolve_deprecation(axis, len(shape), box_size, stride)
-    box_size, stride = broadcast_to_axis(axis, box_size, stride)
-    box_size = fill_by_indices(shape, box_size, axis)
-    stride = fill_by_indices(np.ones_like(shape), stride, axis)
-
-    final_shape = shape_after_convolution(shape, box_size, stride, valid=valid)
-    for start in np.ndindex(*final_shape):
-        start = np.asarray(start) * stride
-        yield make_box_([start, np.minimum(start + box_size, shape)])
+    # all the boxes are valid by construction, so they are yielded as read-only views of a single array
+    boxes = np.stack(get_boxes_batched(shape, box_size, stride, axis, valid), axis=1)
+    boxes.setflags(write=False)
+    yield from boxes
 
 
 def divide(x: np.ndarray, patch_size: AxesLike, stride: AxesLike, axis: AxesLike = None,
@@ -2,7 +2,7 @@
 Tools for patch extraction and generation.
 """
 from functools import partial
-from typing import Callable
+from typing import Callable, Union
 
 import numpy as np
 
@@ -14,10 +14,18 @@ from ..checks import check_shape_along_axis
 from dpipe.itertools import squeeze_first, extract, lmap
 
 
-def uniform(shape, random_state: np.random.RandomState = None):
+def uniform(shape, random_state: Union[np.random.RandomState, np.random.Generator, int] = None):
+    """Sample a random number in the range ``[0, n)`` for each ``n`` in ``shape``."""
+    shape = np.atleast_1d(shape)
+    if random_state is None:
+        # a new generator with fresh entropy, so that forked processes don't share the same state
+        return np.random.default_rng().integers(shape)
+    if isinstance(random_state, np.random.Generator):
+        return random_state.integers(shape)
+
     if not isinstance(random_state, np.random.RandomState):
         random_state = np.random.RandomState(seed=random_state)
-    return np.array(lmap(random_state.randint, np.atleast_1d(shape)))
+    return random_state.randint(shape)
 
 
 def sample_box_center_uniformly(shape, box_size: np.array, random_state: np.random.RandomState = None):
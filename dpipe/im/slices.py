@@ -4,11 +4,15 @@ from ..checks import check_shape_along_axis
 
 
 def iterate_slices(*data: np.ndarray, axis: int):
-    """Iterate over slices of a series of tensors along a given axis."""
+    """
+    Iterate over slices of a series of tensors along a given axis.
+    The slices are views of the original tensors.
+    """
     check_shape_along_axis(*data, axis=axis)
 
-    for idx in range(data[0].shape[axis]):
-        yield tuple(x.take(idx, axis=axis) for x in data)
+    views = [np.moveaxis(x, axis, 0) for x in data]
+    for idx in range(len(views[0])):
+        yield tuple(view[idx] for view in views)
 
 
 def iterate_axis(x: np.ndarray, axis: int):
@@ -8,6 +8,7 @@ Similarly, all the saving functions have the interface ``save(value, path, **kwa
 """
 import argparse
 import json
+import math
 import pickle
 import re
 import os
@@ -17,6 +18,11 @@ from gzip import GzipFile
 
 import numpy as np
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 __all__ = [
     'PathLike', 'ConsoleArguments', 'load_or_create', 'choose_existing',
     'load', 'save',
@@ -30,7 +36,7 @@ __all__ = [
 PathLike = Union[Path, str]
 
 
-def load_pred(identifier, predictions_path):
+def load_pred(identifier, predictions_path, eager: bool = False):
     """
     Loads the prediction numpy tensor with specified id.
 
@@ -40,6 +46,9 @@ def load_pred(identifier, predictions_path):
         id to load, could be either the file name ends with ``.npy``
     predictions_path: str
         path where to load prediction from
+    eager: bool
+        whether to load the whole prediction into memory. By default, if the prediction is already stored
+        as ``float32``, a read-only memory-mapped array is returned, so that only the accessed parts are read.
 
     Returns
     -------
@@ -55,19 +64,21 @@ def load_pred(identifier, predictions_path):
     else:
         raise TypeError(f'`identifier` should be either `int` or `str`, {type(identifier)} given')
 
-    return np.float32(np.load(os.path.join(predictions_path, _id)))
+    prediction = np.load(os.path.join(predictions_path, _id), mmap_mode=None if eager else 'r', allow_pickle=False)
+    return prediction.astype(np.float32, copy=False)
 
 
 def load_experiment_test_pred(identifier, experiment_path):
-    ep = Path(experiment_path)
-    for f in os.listdir(ep):
-        if os.path.isdir(ep / f):
-            try:
-                return load_pred(identifier, ep / f / 'test_predictions')
-            except FileNotFoundError:
-                pass
-    else:
-        raise FileNotFoundError('No prediction found')
+    # `scandir` reuses the file types obtained while listing the directory
+    with os.scandir(experiment_path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                try:
+                    return load_pred(identifier, os.path.join(entry.path, 'test_predictions'))
+                except FileNotFoundError:
+                    pass
+
+    raise FileNotFoundError('No prediction found')
 
 
 def load(path: PathLike, ext: str = None, **kwargs):
@@ -78,6 +89,8 @@ def load(path: PathLike, ext: str = None, **kwargs):
     The following extensions are supported:
         npy, tif, png, jpg, bmp, hdr, img, csv,
         dcm, nii, nii.gz, json, mhd, csv, txt, pickle, pkl, config
+
+    Pass ``mmap_mode='r'`` to memory-map ``.npy`` files instead of reading them into memory, see `load_numpy`.
     """
     name = Path(path).name if ext is None else ext
 
@@ -155,8 +168,17 @@ def save(value, path: PathLike, **kwargs):
 
 def load_json(path: PathLike):
     """Load the contents of a json file."""
-    with open(path, 'r') as f:
-        return json.load(f)
+    if orjson is None:
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    with open(path, 'rb') as f:
+        content = f.read()
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        # e.g. NaN and Infinity are not supported by orjson
+        return json.loads(content)
 
 
 class NumpyEncoder(json.JSONEncoder):
@@ -168,8 +190,66 @@ class NumpyEncoder(json.JSONEncoder):
         return super().default(o)
 
 
+def _numpy_to_builtin(o):
+    if isinstance(o, (np.generic, np.ndarray)):
+        return o.tolist()
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+def _orjson_compatible(value) -> bool:
+    """
+    Whether orjson serializes ``value`` exactly as the standard library does.
+    E.g. orjson silently replaces NaN and infinity by null, writes the shortest representation of float32 numbers,
+    and natively supports dates, enums and dataclasses, which the standard library rejects.
+    """
+    if value is None or type(value) in (bool, int, str):
+        return True
+    if type(value) is float:
+        return math.isfinite(value)
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in 'biu':
+            return True
+        if value.dtype == np.float64:
+            return bool(np.isfinite(value).all())
+        return value.dtype == object and _orjson_compatible(value.tolist())
+    if isinstance(value, np.generic):
+        return value.dtype != np.float32 and _orjson_compatible(value.item())
+    if isinstance(value, dict):
+        return all(
+            (key is None or type(key) in (bool, int, str, float)) and _orjson_compatible(key) and _orjson_compatible(x)
+            for key, x in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return all(map(_orjson_compatible, value))
+    return False
+
+
 def save_json(value, path: PathLike, *, indent: int = None):
-    """Dump a json-serializable object to a json file."""
+    """
+    Dump a json-serializable object to a json file.
+
+    If ``orjson`` is installed, it is used to serialize numpy arrays without converting them to lists,
+    as long as the result is the same as the one of the standard library.
+    """
+    if orjson is not None and indent in (None, 2) and _orjson_compatible(value):
+        # the types unsupported by the standard library are passed to `default`, which rejects them
+        option = (
+            orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_SUBCLASS
+        )
+        if indent is not None:
+            option |= orjson.OPT_INDENT_2
+
+        try:
+            content = orjson.dumps(value, default=_numpy_to_builtin, option=option)
+        except orjson.JSONEncodeError:
+            # fallback to the standard library for everything orjson doesn't support
+            pass
+        else:
+            with open(path, 'wb') as f:
+                f.write(content)
+            return
+
     with open(path, 'w') as f:
         json.dump(value, f, indent=indent, cls=NumpyEncoder)
 
@@ -184,13 +264,22 @@ def save_numpy(value, path: PathLike, *, allow_pickle: bool = True, fix_imports:
     np.save(path, value, allow_pickle=allow_pickle, fix_imports=fix_imports)
 
 
-def load_numpy(path: PathLike, *, allow_pickle: bool = True, fix_imports: bool = True, decompress: bool = False):
-    """A wrapper around ``np.load`` with ``allow_pickle`` set to True by default."""
+def load_numpy(path: PathLike, *, allow_pickle: bool = True, fix_imports: bool = True, decompress: bool = False,
+               mmap_mode: str = None):
+    """
+    A wrapper around ``np.load`` with ``allow_pickle`` set to True by default.
+
+    If ``mmap_mode`` is provided (e.g. 'r'), the array is memory-mapped, i.e. the data is read from the file
+    only when it is accessed. Memory-mapping is not available for compressed files.
+    """
     if decompress:
+        if mmap_mode is not None:
+            raise ValueError('Compressed arrays cannot be memory-mapped.')
+
         with GzipFile(path, 'rb') as file:
             return load_numpy(file, allow_pickle=allow_pickle, fix_imports=fix_imports)
 
-    return np.load(path, allow_pickle=allow_pickle, fix_imports=fix_imports)
+    return np.load(path, mmap_mode=mmap_mode, allow_pickle=allow_pickle, fix_imports=fix_imports)
 
 
 def save_pickle(value, path: PathLike):
@@ -265,17 +354,19 @@ def choose_existing(*paths: PathLike) -> Path:
 class ConsoleArguments:
     """A class that simplifies access to console arguments."""
 
+    __slots__ = '_args',
     _argument_pattern = re.compile(r'^--[^\d\W]\w*$')
 
     def __init__(self):
         parser = argparse.ArgumentParser()
         args = parser.parse_known_args()[1]
         # allow for positional arguments:
-        while args and not self._argument_pattern.match(args[0]):
-            args = args[1:]
+        start = 0
+        while start < len(args) and not self._argument_pattern.match(args[start]):
+            start += 1
 
         self._args = {}
-        for arg, value in zip(args[::2], args[1::2]):
+        for arg, value in zip(args[start::2], args[start + 1::2]):
             if not self._argument_pattern.match(arg):
                 raise ValueError(f'Invalid console argument: {arg}')
             self._args[arg[2:]] = value
@@ -304,5 +395,5 @@ class ConsoleArguments:
         """
         if len(kwargs) != 1:
             raise ValueError(f'This method takes exactly one argument, but {len(kwargs)} were passed.')
-        name, value = list(kwargs.items())[0]
+        name, value = next(iter(kwargs.items()))
         return self._args.get(name, value)
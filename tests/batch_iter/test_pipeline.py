@@ -1,12 +1,19 @@
+import subprocess
+import sys
+import textwrap
 import time
 from collections import Counter
-from itertools import repeat
+from itertools import repeat, count, cycle
 
+import numpy as np
 import pytest
 from pdp import StopEvent
 
-from dpipe.batch_iter import Infinite, combine_to_arrays, Threads, Loky
+from dpipe.batch_iter import Infinite, combine_to_arrays, combine_pad, Threads, Loky
 from dpipe.batch_iter.pipeline import wrap_pipeline
+from dpipe.batch_iter._pdp import SharedArray, SharedResult, _write_shared, _read_shared
+
+requires_shared_memory = pytest.mark.skipif(sys.version_info < (3, 8), reason='requires python 3.8')
 
 
 def test_wrapper():
@@ -147,3 +154,139 @@ def test_del():
     p = pipeline(repeat([1]), 1)
     assert len(list(p())) == 1
     del p
+
+
+def test_combine_to_arrays():
+    x, y = combine_to_arrays([(np.zeros((2, 3)), 1), (np.ones((2, 3)), 2)])
+    assert x.shape == (2, 2, 3) and x.dtype == float
+    np.testing.assert_array_equal(x[1], 1)
+    np.testing.assert_array_equal(y, [1, 2])
+
+    # dtypes are promoted like in `np.array`
+    y, = combine_to_arrays([(1,), (2.5,)])
+    np.testing.assert_array_equal(y, [1, 2.5])
+
+    with pytest.raises(ValueError):
+        combine_to_arrays([(1, 2), (1,)])
+
+
+def test_threads_order():
+    size = 50
+    for n_workers in [1, 3]:
+        transform = Threads(lambda x: time.sleep(x % 3 / 100) or x, n_workers=n_workers)
+        assert list(wrap_pipeline(range(size), transform)) == list(range(size))
+
+    with pytest.warns(UserWarning):
+        transform = Threads(lambda x: x ** 2, n_workers=2, expects_gil_release=False)
+    assert Counter(wrap_pipeline(range(size), transform)) == Counter(x ** 2 for x in range(size))
+
+
+@requires_shared_memory
+def test_loky_shared_memory():
+    size = 20
+    # the last values don't fit into the slabs and are pickled as usual
+    transform = Loky(lambda x: np.full(x + 1, x, dtype=float), n_workers=2, sample_nbytes=8 * 15)
+    items = sorted(wrap_pipeline(range(size), transform), key=len)
+    for i, item in enumerate(items):
+        np.testing.assert_array_equal(item, np.full(i + 1, i, dtype=float))
+
+    transform = Loky(lambda x: x ** 2, n_workers=2, sample_nbytes=8)
+    assert Counter(wrap_pipeline(range(size), transform)) == Counter(x ** 2 for x in range(size))
+
+    # the arrays inside tuples are passed through the slabs as well
+    transform = Loky(lambda x: (np.full(x + 1, x, dtype=np.int8), np.float64(x), x), n_workers=2, sample_nbytes=24)
+    items = sorted(wrap_pipeline(range(size), transform), key=lambda item: item[-1])
+    for i, (x, y, z) in enumerate(items):
+        np.testing.assert_array_equal(x, np.full(i + 1, i, dtype=np.int8))
+        assert y == z == i
+
+
+@requires_shared_memory
+def test_write_shared():
+    from multiprocessing.shared_memory import SharedMemory
+
+    shm = SharedMemory(create=True, size=64)
+    try:
+        value = np.arange(3, dtype=np.int8), 'label', np.ones((2, 2)), None
+        result = _write_shared(shm.name, lambda x: x, value)
+        assert isinstance(result, SharedResult) and not result.single
+        # the float array is aligned
+        assert [field.offset for field in result.fields if isinstance(field, SharedArray)] == [0, 8]
+        for x, y in zip(_read_shared(shm, result), value):
+            np.testing.assert_array_equal(x, y)
+
+        result = _write_shared(shm.name, lambda x: x, np.arange(4.))
+        assert isinstance(result, SharedResult) and result.single
+        np.testing.assert_array_equal(_read_shared(shm, result), np.arange(4.))
+
+        # too large results, other containers and objects are returned as is
+        for value in [(np.zeros(5), np.zeros(5)), [np.zeros(1)], 'text']:
+            assert _write_shared(shm.name, lambda x: x, value) is value
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+@requires_shared_memory
+def test_loky_shared_memory_tracking():
+    # the resource tracker complains to stderr if the slabs are not registered correctly
+    script = textwrap.dedent('''
+        import numpy as np
+        from dpipe.batch_iter import Loky
+        from dpipe.batch_iter.pipeline import wrap_pipeline
+
+        transform = Loky(lambda x: np.full(10, x), n_workers=2, sample_nbytes=80)
+        assert len(list(wrap_pipeline(range(20), transform))) == 20
+    ''')
+    result = subprocess.run(
+        [sys.executable, '-c', script], stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert not result.stderr, result.stderr
+
+
+def test_combine_pad():
+    inputs = [(np.ones(2), np.ones(1)), (np.ones(4), np.ones(3))]
+    x, y = combine_pad(inputs)
+    np.testing.assert_array_equal(x, [[0, 1, 1, 0], [1, 1, 1, 1]])
+    np.testing.assert_array_equal(y, [[0, 1, 0], [1, 1, 1]])
+
+    x, y = combine_pad(inputs, padding_values=[2, np.min])
+    np.testing.assert_array_equal(x, [[2, 1, 1, 2], [1, 1, 1, 1]])
+    np.testing.assert_array_equal(y, [[1, 1, 1], [1, 1, 1]])
+
+    x, y = combine_pad(inputs, padding_values=np.min)
+    np.testing.assert_array_equal(x, 1)
+
+
+def test_reuse_buffers():
+    source = ((np.full(3, i), i) for i in count())
+    with Infinite(source, batch_size=2, batches_per_epoch=10, reuse_buffers=True) as p:
+        batches = []
+        for i, (x, y) in enumerate(p()):
+            np.testing.assert_array_equal(y, [2 * i, 2 * i + 1])
+            np.testing.assert_array_equal(x, np.repeat(y[:, None], 3, 1))
+            batches.append(x)
+
+    # the arrays were reused
+    assert len({id(x) for x in batches}) < len(batches)
+
+    # heterogeneous fields are combined as usual
+    source = ((i, i + 0.5 * (i % 2)) for i in count())
+    with Infinite(source, batch_size=2, batches_per_epoch=5, reuse_buffers=True) as p:
+        for i, (x, y) in enumerate(p()):
+            np.testing.assert_array_equal(x, [2 * i, 2 * i + 1])
+            np.testing.assert_array_equal(y, [2 * i, 2 * i + 1.5])
+
+    # mixed dtypes are promoted like in `combine_to_arrays`
+    for field in [(np.int8(1), 300), (np.float32(0.1), np.float64(0.1)), (1, 2.5)]:
+        source = cycle(zip(field))
+        with Infinite(source, batch_size=2, batches_per_epoch=2, reuse_buffers=True) as p:
+            for x, in p():
+                expected, = combine_to_arrays(zip(field))
+                assert x.dtype == expected.dtype
+                np.testing.assert_array_equal(x, expected)
+
+    with pytest.raises(ValueError):
+        Infinite(source, batch_size=2, batches_per_epoch=10, combiner=combine_pad, reuse_buffers=True)
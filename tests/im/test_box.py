@@ -40,6 +40,7 @@ class TestBox(unittest.TestCase):
         limit = np.array((10, 10, 10))
         box = np.array(((0, -1, -10), (10, 100, 17)))
         np.testing.assert_array_equal(get_box_padding(box, limit).T, ((0, 1, 10), (0, 90, 7)))
+        np.testing.assert_array_equal(get_box_padding(((2, 0), (3, 12)), (5, 10)), ((0, 0), (0, 2)))
 
     def test_add_margin(self):
         box = np.array(((0, -1), (10, 100)))
@@ -64,3 +65,31 @@ class TestBox(unittest.TestCase):
         mask = np.zeros((10, 10))
         mask[2, 3] = mask[4, 5] = True
         np.testing.assert_array_equal(mask2bounding_box(mask), ((2, 3), (5, 6)))
+
+    def test_mask2bounding_box_nd(self):
+        mask = np.zeros((4, 5, 6, 7), bool)
+        mask[1, 2:4, 3, 0] = mask[2, 2, 5, 6] = True
+        np.testing.assert_array_equal(mask2bounding_box(mask), ((1, 2, 3, 0), (3, 4, 6, 7)))
+        np.testing.assert_array_equal(mask2bounding_box(np.array([0, 1, 1, 0])), ((1,), (3,)))
+
+        with self.assertRaises(ValueError):
+            mask2bounding_box(np.zeros_like(mask))
+
+    def test_boxes2slices(self):
+        starts = np.array([[0, 1], [2, 3]])
+        stops = np.array([[4, 5], [6, 7]])
+        self.assertEqual(boxes2slices(starts, stops), [box2slices(np.stack(box)) for box in zip(starts, stops)])
+        with self.assertRaises(ValueError):
+            boxes2slices(starts, stops[:, :1])
+
+    def test_make_box_from_arrays(self):
+        start, stop = np.array([0, 1]), np.array([2.5, 3])
+        box = make_box_((start, stop))
+        np.testing.assert_array_equal(box, [start, stop])
+        self.assertEqual(box.dtype, float)
+        self.assertFalse(box.flags.writeable)
+        # the inputs are not affected
+        self.assertTrue(start.flags.writeable)
+
+        with self.assertRaises(AssertionError):
+            make_box_((stop, start))
@@ -1,4 +1,5 @@
 import numpy as np
+import torch
 
 from dpipe.im.dist import *
 
@@ -25,3 +26,24 @@ def test_conditional():
     centers = np.full((2, 40), 15)
 
     eq(np.stack(marginal_expectation(dist, (0, 1), polynomial)), centers)
+
+
+def test_polynomial_delta():
+    dist = np.random.uniform(0, 1, size=(5, 7))
+    for order in [0, 1, 2, 3.5]:
+        values = polynomial(8, order)
+        expected = (dist * (values[1:] - values[:-1])).sum(1)
+        eq(expectation(dist, 1, polynomial, order), expected)
+        eq(expectation(dist, 1, order=order), expected)
+
+
+def test_weighted_sum():
+    weights = np.random.uniform(0, 1, size=(3, 4, 5))
+    eq(weighted_sum(weights, 1, np.arange), (weights * np.arange(4)[:, None]).sum(1))
+    eq(weighted_sum(weights, -1, np.arange), (weights * np.arange(5)).sum(-1))
+
+    tensor = torch.tensor(weights, requires_grad=True)
+    result = weighted_sum(tensor, 1, np.arange)
+    eq(result.detach().numpy(), weighted_sum(weights, 1, np.arange))
+    result.sum().backward()
+    eq(tensor.grad.numpy(), np.broadcast_to(np.arange(4)[:, None], weights.shape))
@@ -3,7 +3,7 @@ import unittest
 import numpy as np
 import pytest
 
-from dpipe.im.grid import get_boxes, combine, divide
+from dpipe.im.grid import get_boxes, get_boxes_batched, combine, divide
 
 almost_eq = np.testing.assert_array_almost_equal
 
@@ -39,6 +39,18 @@ class TestGrid(unittest.TestCase):
         self.assertTrue((stop <= shape).all())
         self.assertTrue((start + box_size == stop).all())
 
+    def test_get_boxes_batched(self):
+        for valid in [True, False]:
+            starts, stops = get_boxes_batched(self.x_shape, self.patch_size, self.stride, valid=valid)
+            grid = np.stack(list(get_boxes(self.x_shape, self.patch_size, self.stride, valid=valid)))
+            np.testing.assert_array_equal(starts, grid[:, 0])
+            np.testing.assert_array_equal(stops, grid[:, 1])
+            self.assertTrue(starts.flags.c_contiguous and stops.flags.c_contiguous)
+
+        box = next(get_boxes(self.x_shape, self.patch_size, self.stride))
+        with self.assertRaisesRegex(ValueError, 'read-only'):
+            box[0, 0] = 1
+
 
 def test_combine_int():
     patch_size = np.array([20] * 3, int)
@@ -1,9 +1,10 @@
+import os
 import unittest
 
 import numpy as np
 import pytest
 
-from dpipe.im.patch import sample_box_center_uniformly, get_random_patch, get_random_box
+from dpipe.im.patch import sample_box_center_uniformly, get_random_patch, get_random_box, uniform
 from dpipe.im.box import make_box_, get_centered_box
 from dpipe.im.shape_ops import crop_to_box
 from dpipe.im.utils import get_random_tuple
@@ -100,3 +101,36 @@ def test_get_random_box(subtests):
 
     with pytest.raises(ValueError):
         get_random_box([3], [4])
+
+
+def test_uniform_random_state():
+    shape = [10, 20, 30]
+    np.testing.assert_array_equal(uniform(shape, random_state=7), uniform(shape, random_state=7))
+    np.testing.assert_array_equal(
+        uniform(shape, random_state=np.random.default_rng(7)), uniform(shape, random_state=np.random.default_rng(7))
+    )
+    for random_state in [None, 0, np.random.RandomState(0), np.random.default_rng(0)]:
+        values = uniform(shape, random_state)
+        assert values.shape == (3,)
+        assert ((0 <= values) & (values < shape)).all()
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+def test_uniform_fork():
+    shape = [10 ** 9] * 3
+    uniform(shape)
+
+    values = []
+    for _ in range(3):
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write, uniform(shape).tobytes())
+            os._exit(0)
+
+        os.close(write)
+        with os.fdopen(read, 'rb') as file:
+            values.append(file.read())
+        os.waitpid(pid, 0)
+
+    assert len(set(values)) == len(values)
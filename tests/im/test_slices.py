@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from dpipe.im.slices import iterate_slices
+
+
+def test_iterate_slices():
+    x = np.random.randn(3, 4, 5)
+    y = np.random.randn(2, 4, 5)
+
+    for axis in [0, 1, 2, -1, -2, -3]:
+        slices = list(iterate_slices(x, x + 1, axis=axis))
+        assert len(slices) == x.shape[axis]
+
+        for idx, (a, b) in enumerate(slices):
+            assert np.shares_memory(a, x)
+            np.testing.assert_array_equal(a, np.take(x, idx, axis))
+            np.testing.assert_array_equal(b, np.take(x + 1, idx, axis))
+
+    for axis in [1, 2, -1]:
+        for idx, (a, b) in enumerate(iterate_slices(x, y, axis=axis)):
+            np.testing.assert_array_equal(a, np.take(x, idx, axis))
+            np.testing.assert_array_equal(b, np.take(y, idx, axis))
+
+    with pytest.raises(ValueError):
+        next(iterate_slices(x, y, axis=0))
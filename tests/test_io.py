@@ -0,0 +1,129 @@
+from datetime import date
+from enum import Enum
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from dpipe.io import (
+    load_pred, load_experiment_test_pred, load_numpy, load, save_numpy, load_json, save_json, ConsoleArguments,
+)
+
+
+def test_load_pred(tmp_path):
+    x = np.random.randn(3, 4).astype(np.float32)
+    np.save(tmp_path / 'x.npy', x)
+    np.save(tmp_path / '1.npy', x.astype(float))
+
+    lazy = load_pred('x', tmp_path)
+    assert isinstance(lazy, np.memmap)
+    assert not lazy.flags.writeable
+    np.testing.assert_array_equal(lazy, x)
+
+    eager = load_pred('x.npy', tmp_path, eager=True)
+    assert not isinstance(eager, np.memmap)
+    assert eager.flags.owndata
+    np.testing.assert_array_equal(eager, x)
+
+    converted = load_pred(1, tmp_path)
+    assert converted.dtype == np.float32
+    np.testing.assert_array_equal(converted, x)
+
+
+def test_load_numpy_mmap(tmp_path):
+    x = np.arange(10)
+    save_numpy(x, tmp_path / 'x.npy')
+    assert isinstance(load(tmp_path / 'x.npy', mmap_mode='r'), np.memmap)
+    np.testing.assert_array_equal(load(tmp_path / 'x.npy', mmap_mode='r'), x)
+
+    save_numpy(x, tmp_path / 'x.npy.gz', compression=1)
+    with pytest.raises(ValueError):
+        load_numpy(tmp_path / 'x.npy.gz', decompress=True, mmap_mode='r')
+
+
+def test_console_arguments(monkeypatch):
+    monkeypatch.setattr('sys.argv', ['script.py', 'positional', '--first', '1', '--second', 'value'])
+    console = ConsoleArguments()
+    assert console.first == '1'
+    assert console.second == 'value'
+    assert console(second='default') == 'value'
+    assert console(third='default') == 'default'
+
+    with pytest.raises(AttributeError):
+        console.third
+    with pytest.raises(ValueError):
+        console(first=1, second=2)
+    with pytest.raises(AttributeError):
+        console.new_attribute = 1
+
+    monkeypatch.setattr('sys.argv', ['script.py', '--first', '1', 'second', 'value'])
+    with pytest.raises(ValueError):
+        ConsoleArguments()
+
+
+def test_json(tmp_path):
+    path = tmp_path / 'x.json'
+    value = {'array': np.arange(6).reshape(2, 3), 'scalar': np.float32(0.5), 1: [np.int64(2), 'text', None]}
+    expected = {'array': [[0, 1, 2], [3, 4, 5]], 'scalar': 0.5, '1': [2, 'text', None]}
+    for indent in [None, 0, 2, 4]:
+        save_json(value, path, indent=indent)
+        assert load_json(path) == expected
+
+    # non-contiguous arrays
+    save_json(np.arange(6).reshape(2, 3).T, path)
+    assert load_json(path) == [[0, 3], [1, 4], [2, 5]]
+
+    # NaN and infinity are preserved
+    save_json({'nan': np.nan, 'array': np.array([1, np.inf])}, path)
+    result = load_json(path)
+    assert np.isnan(result['nan']) and result['array'] == [1, np.inf]
+
+    with pytest.raises(TypeError):
+        save_json({'x': object()}, path)
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_json_backends(tmp_path, monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr('dpipe.io.orjson', None)
+
+    path = tmp_path / 'x.json'
+    # the written values don't depend on the backend
+    for value, expected in [
+        (np.float32(0.1), float(np.float32(0.1))),
+        (np.array([0.1, 0.5], np.float32), [float(np.float32(0.1)), 0.5]),
+        ({1.5: np.float64(0.1), True: np.int8(1), None: np.bool_(True)}, {'1.5': 0.1, 'true': 1, 'null': True}),
+        (np.array([[1, 2]], np.uint8), [[1, 2]]),
+        (np.array(['a', 'b']), ['a', 'b']),
+    ]:
+        save_json(value, path)
+        assert load_json(path) == expected
+
+    class Color(Enum):
+        RED = 1
+
+    unsupported = [date(2020, 1, 1), uuid4(), Color.RED, [{'x': Color.RED}], {Color.RED: 1}]
+    try:
+        from dataclasses import make_dataclass
+        unsupported.append(make_dataclass('Data', ['x'])(1))
+    except ImportError:
+        # python 3.6
+        pass
+
+    for value in unsupported:
+        with pytest.raises(TypeError):
+            save_json(value, path)
+
+
+def test_load_experiment_test_pred(tmp_path):
+    x = np.random.randn(3, 4).astype(np.float32)
+    for fold in ['fold_0', 'fold_1']:
+        (tmp_path / fold / 'test_predictions').mkdir(parents=True)
+    (tmp_path / 'file.txt').write_text('not a fold')
+    np.save(tmp_path / 'fold_1' / 'test_predictions' / 'x.npy', x)
+
+    np.testing.assert_array_equal(load_experiment_test_pred('x', tmp_path), x)
+    with pytest.raises(FileNotFoundError):
+        load_experiment_test_pred('y', tmp_path)